@@ -1,11 +1,22 @@
+import contextlib
 import csv
 import datetime
+import io
 import os
+import re
 import shutil
-from dataclasses import dataclass
-from typing import List, Optional, Tuple
+import sys
+from dataclasses import dataclass, field
+from functools import lru_cache
+from html import escape as _escape
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from string import Template
 
+try:
+    import readline  # line editing, history and Tab completion at the prompts
+except ImportError:  # e.g. Windows without pyreadline3
+    readline = None
+
 # =========================
 #  COMPANY / PATH SETTINGS
 # =========================
@@ -19,6 +30,22 @@ COMPANY_LICENSE = "CL#: 1085341"
 # Put your logo PNG/JPG file in the SAME folder as this script
 COMPANY_LOGO_FILENAME = "CienegaLogo.png"   # or "" to hide logo
 
+# Resolved once at startup so rendering/saving does not re-stat the logo per document
+_LOGO_SOURCE: Optional[str] = (
+    os.path.abspath(COMPANY_LOGO_FILENAME)
+    if COMPANY_LOGO_FILENAME and os.path.exists(COMPANY_LOGO_FILENAME)
+    else None
+)
+
+# Company block placeholders, escaped and bound once, shared by every rendered document
+_COMPANY_FIELDS = {
+    "company_name": _escape(COMPANY_NAME),
+    "company_city_line": _escape(COMPANY_CITY_LINE),
+    "company_phone": _escape(COMPANY_PHONE),
+    "company_email": _escape(COMPANY_EMAIL),
+    "company_license": _escape(COMPANY_LICENSE),
+}
+
 # Root folder where all jobs live; default is Desktop/CienegaJobs
 ROOT_BASE_DIR = os.path.join(os.path.expanduser("~"), "Desktop", "CienegaJobs")
 
@@ -31,16 +58,27 @@ COLOR_SECTION = "\033[94m"  # blue for section titles
 COLOR_PROMPT = "\033[92m"   # green for user prompts
 COLOR_RESET = "\033[0m"     # reset
 
+# When readline draws the prompt, color codes must be marked zero-width (\001..\002)
+# or the cursor column drifts while editing. Only then: piped runs would print them.
+if readline is not None and sys.stdin is not None and sys.stdin.isatty() and sys.stdout.isatty():
+    _PROMPT_START, _PROMPT_END = f"\001{COLOR_PROMPT}\002", f"\001{COLOR_RESET}\002"
+else:
+    _PROMPT_START, _PROMPT_END = COLOR_PROMPT, COLOR_RESET
 
+
+# Prompts and menu titles repeat on every loop pass; wrap each distinct text once
+@lru_cache(maxsize=256)
 def colored_prompt(msg: str) -> str:
     """Wrap an input prompt message in green."""
-    return f"{COLOR_PROMPT}{msg}{COLOR_RESET}"
+    return f"{_PROMPT_START}{msg}{_PROMPT_END}"
 
 
+@lru_cache(maxsize=256)
 def colored_header(msg: str) -> str:
     return f"{COLOR_HEADER}{msg}{COLOR_RESET}"
 
 
+@lru_cache(maxsize=256)
 def colored_section(msg: str) -> str:
     return f"{COLOR_SECTION}{msg}{COLOR_RESET}"
 
@@ -54,19 +92,33 @@ DATE_FORMAT = "%m-%d-%Y"
 
 def format_date(date_obj: datetime.date) -> str:
     """Return MM-DD-YYYY string."""
-    return date_obj.strftime(DATE_FORMAT)
+    return f"{date_obj.month:02d}-{date_obj.day:02d}-{date_obj.year:04d}"
 
 
+@lru_cache(maxsize=4096)
 def parse_mmddyyyy(date_str: str) -> datetime.date:
-    """Parse MM-DD-YYYY into a date object."""
-    return datetime.datetime.strptime(date_str, DATE_FORMAT).date()
+    """
+    Parse MM-DD-YYYY into a date object.
+    Accepts the same input as strptime(DATE_FORMAT) without its per-call
+    format parsing; raises ValueError otherwise. Receipt files repeat a
+    handful of dates, so results are cached.
+    """
+    parts = date_str.split("-")
+    if len(parts) == 3:
+        month, day, year = parts
+        if (
+            month.isdigit() and day.isdigit() and year.isdigit()
+            and len(month) <= 2 and len(day) <= 2 and len(year) == 4
+        ):
+            return datetime.date(int(year), int(month), int(day))
+    raise ValueError(f"time data {date_str!r} does not match format {DATE_FORMAT!r}")
 
 
 # =========================
 #  DATA MODELS
 # =========================
 
-@dataclass
+@dataclass(slots=True)
 class EstimateLine:
     """
     For both quotes & invoices.
@@ -85,6 +137,9 @@ class EstimateLine:
           hours = hours worked
           rate = hourly rate
       - Material lines same as above.
+
+    'total' (hours * rate) is computed once on construction; lines are
+    never edited in place.
     """
     section: str = ""       # subheading like "Interior Paint", "Framing & Demo"
     description: str = ""
@@ -92,13 +147,13 @@ class EstimateLine:
     hours: float = 0.0
     rate: float = 0.0
     detail: str = ""
+    total: float = field(init=False, default=0.0)
 
-    @property
-    def total(self) -> float:
-        return self.hours * self.rate
+    def __post_init__(self) -> None:
+        self.total = self.hours * self.rate
 
 
-@dataclass
+@dataclass(slots=True)
 class OwnerAllowance:
     """
     Items the client will purchase directly (appliances, finishes, etc.)
@@ -107,10 +162,10 @@ class OwnerAllowance:
     description: str
     quantity: float
     unit_cost: float
+    total: float = field(init=False, default=0.0)
 
-    @property
-    def total(self) -> float:
-        return self.quantity * self.unit_cost
+    def __post_init__(self) -> None:
+        self.total = self.quantity * self.unit_cost
 
 
 # =========================
@@ -121,50 +176,144 @@ def ensure_root_dir() -> None:
     os.makedirs(ROOT_BASE_DIR, exist_ok=True)
 
 
+# Directory listings reused within a session: path -> (mtime_ns, entries)
+_DIR_CACHE: Dict[str, Tuple[int, Tuple[Tuple[str, bool, bool], ...]]] = {}
+_DIR_CACHE_MAX = 64
+
+
+def _cached_listing(path: str) -> Tuple[Tuple[str, bool, bool], ...]:
+    """
+    Returns (name, is_dir, is_file) for every entry in a directory.
+    The scan is reused until the directory's mtime changes or the
+    path is invalidated after one of our own writes.
+    """
+    key = os.path.normpath(path)
+    mtime = os.stat(key).st_mtime_ns
+    cached = _DIR_CACHE.pop(key, None)
+    if cached is None or cached[0] != mtime:
+        with os.scandir(key) as it:
+            entries = tuple((e.name, e.is_dir(), e.is_file()) for e in it)
+        cached = (mtime, entries)
+
+    # Re-inserting keeps the most recently used listing last
+    _DIR_CACHE[key] = cached
+    if len(_DIR_CACHE) > _DIR_CACHE_MAX:
+        del _DIR_CACHE[next(iter(_DIR_CACHE))]
+    return cached[1]
+
+
+def _invalidate_dir_cache(path: str) -> None:
+    _DIR_CACHE.pop(os.path.normpath(path), None)
+
+
+# Job folders start with "J####", e.g. "J0005 - Bathroom_Remodel"
+_JOB_RE = re.compile(r"^J(\d{4})")
+
+
 def _job_counter_path() -> str:
     return os.path.join(ROOT_BASE_DIR, "job_counter.txt")
 
 
+def _read_counter(path: str) -> Optional[int]:
+    """Returns the number stored in job_counter.txt, or None if missing/invalid."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return None
+    try:
+        txt = os.read(fd, 32).decode("utf-8", errors="replace").strip()
+    finally:
+        os.close(fd)
+    return int(txt) if txt.isdigit() else None
+
+
+def _write_counter(path: str, value: int) -> None:
+    """
+    Write through a temp file and os.replace so an interrupted write can
+    never leave an empty or half-written counter behind.
+    """
+    tmp_path = path + ".tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, str(value).encode("utf-8"))
+    finally:
+        os.close(fd)
+    os.replace(tmp_path, path)
+    # The rename itself bumps the folder mtime; stamp the counter after it so
+    # _counter_is_current() holds until something else changes the folder.
+    os.utime(path)
+
+
+def _counter_is_current(path: str) -> bool:
+    """True if job_counter.txt is at least as new as the last change to ROOT_BASE_DIR."""
+    try:
+        return os.stat(path).st_mtime_ns >= os.stat(ROOT_BASE_DIR).st_mtime_ns
+    except OSError:
+        return False
+
+
+def _scan_max_job_number() -> int:
+    """Highest J#### number among the job folders in ROOT_BASE_DIR (0 if none)."""
+    match = _JOB_RE.match
+    max_n = 0
+    with os.scandir(ROOT_BASE_DIR) as it:
+        for entry in it:
+            m = match(entry.name)
+            if m is None:
+                continue
+            value = int(m.group(1))
+            if value > max_n and entry.is_dir():
+                max_n = value
+    return max_n
+
+
+def _bump_counter_past_folders(counter_path: str, counter: Optional[int]) -> int:
+    """
+    Next job number past both the counter and every J#### folder on disk;
+    records it in job_counter.txt and returns it.
+    """
+    next_n = max(counter or 0, _scan_max_job_number()) + 1
+    _write_counter(counter_path, next_n)
+    return next_n
+
+
 def get_next_job_id() -> str:
     """
     Finds the next available Job ID.
 
-    - Scans existing job folders in ROOT_BASE_DIR whose names start with "J####"
     - Reads job_counter.txt if present
-    - Uses the highest number from both, then returns the next one (e.g. max 4 -> J0005)
+    - If nothing in ROOT_BASE_DIR changed since the counter was written, the
+      counter is already the highest number and is used directly
+    - Otherwise also scans job folders whose names start with "J####"
+    - Uses the highest number found, then returns the next one (e.g. max 4 -> J0005)
     """
     ensure_root_dir()
-    max_n = 0
-
-    # Look at existing job folders
-    for name in os.listdir(ROOT_BASE_DIR):
-        path = os.path.join(ROOT_BASE_DIR, name)
-        if not os.path.isdir(path):
-            continue
-        prefix = name[:5]
-        if len(prefix) == 5 and prefix[0] == "J" and prefix[1:].isdigit():
-            value = int(prefix[1:])
-            if value > max_n:
-                max_n = value
 
     # Look at job_counter.txt
     counter_path = _job_counter_path()
-    if os.path.exists(counter_path):
-        with open(counter_path, "r", encoding="utf-8") as f:
-            txt = f.read().strip()
-            if txt.isdigit():
-                value = int(txt)
-                if value > max_n:
-                    max_n = value
+    counter = _read_counter(counter_path)
 
-    next_n = max_n + 1
+    if counter is not None and _counter_is_current(counter_path):
+        next_n = counter + 1
+        _write_counter(counter_path, next_n)
+        return f"J{next_n:04d}"
+
+    # Look at existing job folders
+    return f"J{_bump_counter_past_folders(counter_path, counter):04d}"
 
-    with open(counter_path, "w", encoding="utf-8") as f:
-        f.write(str(next_n))
 
-    return f"J{next_n:04d}"
+def _allocate_empty_job_folder(project_name: Optional[str]) -> Tuple[str, str]:
+    """
+    Assigns a Job ID past every J#### folder on disk and creates its folder,
+    which is therefore guaranteed to be new and empty. Returns (job_id, job_dir).
+    """
+    ensure_root_dir()
+    counter_path = _job_counter_path()
+    job_id = f"J{_bump_counter_past_folders(counter_path, _read_counter(counter_path)):04d}"
+    return job_id, get_job_folder(job_id, project_name)
 
 
+@lru_cache(maxsize=256)
 def sanitize_name(name: str) -> str:
     safe = "".join(c for c in name if c.isalnum() or c in (" ", "_", "-", "."))
     safe = safe.strip().replace(" ", "_")
@@ -183,6 +332,7 @@ def get_job_folder(job_id: str, project_name: Optional[str] = None) -> str:
         folder_name = job_id
     job_dir = os.path.join(ROOT_BASE_DIR, folder_name)
     os.makedirs(job_dir, exist_ok=True)
+    _invalidate_dir_cache(ROOT_BASE_DIR)
     return job_dir
 
 
@@ -195,56 +345,53 @@ def find_existing_job_folders(job_id: str) -> List[str]:
     """
     ensure_root_dir()
     matches: List[str] = []
-    for name in os.listdir(ROOT_BASE_DIR):
-        path = os.path.join(ROOT_BASE_DIR, name)
-        if os.path.isdir(path) and name.startswith(job_id):
-            matches.append(path)
+    for name, is_dir, _ in _cached_listing(ROOT_BASE_DIR):
+        if is_dir and name.startswith(job_id):
+            matches.append(os.path.join(ROOT_BASE_DIR, name))
     matches.sort()
     return matches
 
 
+# (name substring, extension, group label) - checked in order, first match wins
+_FOLDER_FILE_RULES = (
+    ("_quote_", ".csv", "Quotes (CSV)"),
+    ("_quote_", ".html", "Quotes (HTML)"),
+    ("_invoice_", ".csv", "Invoices (CSV)"),
+    ("_invoice_", ".html", "Invoices (HTML)"),
+    ("receipts", ".csv", "Receipts"),
+)
+
+
 def show_job_folder_contents(job_dir: str) -> None:
     """
     Prints out what files exist in a specific job folder.
     """
     print(colored_section(f"\nExisting files in job folder: {os.path.basename(job_dir)}"))
 
-    all_files = sorted(
-        f for f in os.listdir(job_dir)
-        if os.path.isfile(os.path.join(job_dir, f))
-    )
-
-    if not all_files:
-        print("  (No files in this job folder yet.)\n")
-        return
-
-    quotes_csv: List[str] = []
-    quotes_html: List[str] = []
-    invoices_csv: List[str] = []
-    invoices_html: List[str] = []
-    receipts: List[str] = []
+    groups: Dict[str, List[str]] = {label: [] for _, _, label in _FOLDER_FILE_RULES}
     others: List[str] = []
 
-    for fname in all_files:
-        lower = fname.lower()
-        if "_quote_" in lower and lower.endswith(".csv"):
-            quotes_csv.append(fname)
-        elif "_quote_" in lower and lower.endswith(".html"):
-            quotes_html.append(fname)
-        elif "_invoice_" in lower and lower.endswith(".csv"):
-            invoices_csv.append(fname)
-        elif "_invoice_" in lower and lower.endswith(".html"):
-            invoices_html.append(fname)
-        elif "receipts" in lower and lower.endswith(".csv"):
-            receipts.append(fname)
+    # Filter and classify in the same pass; sorting the listing keeps each group in name order
+    for fname, _, is_file in sorted(_cached_listing(job_dir)):
+        if not is_file:
+            continue
+        stem, ext = os.path.splitext(fname.lower())
+        for substr, rule_ext, label in _FOLDER_FILE_RULES:
+            if ext == rule_ext and substr in stem:
+                groups[label].append(fname)
+                break
         else:
             others.append(fname)
 
-    total_quotes = len(quotes_csv) + len(quotes_html)
-    total_invoices = len(invoices_csv) + len(invoices_html)
-    total_receipts = len(receipts)
+    total_quotes = len(groups["Quotes (CSV)"]) + len(groups["Quotes (HTML)"])
+    total_invoices = len(groups["Invoices (CSV)"]) + len(groups["Invoices (HTML)"])
+    total_receipts = len(groups["Receipts"])
     total_others = len(others)
 
+    if not (total_quotes or total_invoices or total_receipts or total_others):
+        print("  (No files in this job folder yet.)\n")
+        return
+
     print(
         f"  Summary: {total_quotes} quote file(s), "
         f"{total_invoices} invoice file(s), "
@@ -259,11 +406,8 @@ def show_job_folder_contents(job_dir: str) -> None:
         for x in items:
             print(f"    - {x}")
 
-    _print_group("Quotes (CSV)", quotes_csv)
-    _print_group("Quotes (HTML)", quotes_html)
-    _print_group("Invoices (CSV)", invoices_csv)
-    _print_group("Invoices (HTML)", invoices_html)
-    _print_group("Receipts", receipts)
+    for label, items in groups.items():
+        _print_group(label, items)
     _print_group("Other files", others)
 
     print("")
@@ -273,29 +417,39 @@ def show_job_folder_contents(job_dir: str) -> None:
 #  RECEIPT FILE HELPERS
 # =========================
 
+# "J0001_receipts.csv" / "J0001_receipts_3.csv" -> ("J0001", None) / ("J0001", "3")
+_RECEIPTS_RE = re.compile(r"^(.+?)_receipts(?:_(\d+))?\.csv$", re.IGNORECASE)
+
+
 def list_receipt_files(job_dir: str, job_id: str) -> List[str]:
     files: List[str] = []
-    for fname in os.listdir(job_dir):
-        if not fname.lower().endswith(".csv"):
-            continue
-        lower = fname.lower()
-        if "receipts" in lower and fname.startswith(job_id):
+    for fname, _, _ in _cached_listing(job_dir):
+        m = _RECEIPTS_RE.match(fname)
+        if m and m.group(1) == job_id:
             files.append(fname)
     files.sort()
     return files
 
 
 def generate_new_receipts_path(job_dir: str, job_id: str) -> str:
-    base = os.path.join(job_dir, f"{job_id}_receipts.csv")
-    if not os.path.exists(base):
-        return base
+    """
+    Returns the base receipts path if it is free, otherwise the next
+    "_receipts_N.csv" after the highest N already in the folder.
+    """
+    has_base = False
+    max_n = 1
+    for fname, _, _ in _cached_listing(job_dir):
+        m = _RECEIPTS_RE.match(fname)
+        if not m or m.group(1) != job_id:
+            continue
+        if m.group(2) is None:
+            has_base = True
+        else:
+            max_n = max(max_n, int(m.group(2)))
 
-    i = 2
-    while True:
-        path = os.path.join(job_dir, f"{job_id}_receipts_{i}.csv")
-        if not os.path.exists(path):
-            return path
-        i += 1
+    if not has_base:
+        return os.path.join(job_dir, f"{job_id}_receipts.csv")
+    return os.path.join(job_dir, f"{job_id}_receipts_{max_n + 1}.csv")
 
 
 def choose_receipt_file_for_logging(job_dir: str, job_id: str) -> str:
@@ -312,16 +466,7 @@ def choose_receipt_file_for_logging(job_dir: str, job_id: str) -> str:
         print(f"  {idx}. {fname}")
     print("  0. Create a NEW receipts file")
 
-    while True:
-        choice = input(colored_prompt(f"Select receipts file (0–{len(existing)}): ")).strip()
-        try:
-            n = int(choice)
-        except ValueError:
-            print("Please enter a valid number.")
-            continue
-        if 0 <= n <= len(existing):
-            break
-        print("Out of range, try again.")
+    n = read_int_in_range(f"Select receipts file (0–{len(existing)}): ", 0, len(existing))
 
     if n == 0:
         path = generate_new_receipts_path(job_dir, job_id)
@@ -350,16 +495,7 @@ def choose_receipt_file_for_invoice(job_dir: str, job_id: str) -> Optional[str]:
         print(f"  {idx}. {fname}")
     print("  0. Cancel (do not include receipts)")
 
-    while True:
-        choice = input(colored_prompt(f"Select receipts file (0–{len(existing)}): ")).strip()
-        try:
-            n = int(choice)
-        except ValueError:
-            print("Please enter a valid number.")
-            continue
-        if 0 <= n <= len(existing):
-            break
-        print("Out of range, try again.")
+    n = read_int_in_range(f"Select receipts file (0–{len(existing)}): ", 0, len(existing))
 
     if n == 0:
         print("Skipping receipts for this invoice.")
@@ -400,11 +536,14 @@ def reorganize_receipts_file(path: str) -> None:
 
     rows.sort(key=sort_key)
 
+    buf = io.StringIO()
+    writer = csv.DictWriter(buf, fieldnames=fieldnames)
+    writer.writeheader()
+    writer.writerows(rows)
+
     try:
         with open(path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(rows)
+            f.write(buf.getvalue())
     except Exception as e:
         print(f"⚠️ Could not write reorganized receipts file: {e}")
 
@@ -413,6 +552,48 @@ def reorganize_receipts_file(path: str) -> None:
 #  INPUT HELPERS
 # =========================
 
+if readline is not None:
+    # Complete whole entries (they contain spaces), not single words
+    readline.set_completer_delims("")
+    if "libedit" in (readline.__doc__ or ""):
+        readline.parse_and_bind("bind ^I rl_complete")
+    else:
+        readline.parse_and_bind("tab: complete")
+
+# Previous answers per kind of prompt (section names, descriptions, ...)
+_PROMPT_HISTORY: Dict[str, List[str]] = {}
+
+
+def _history_completer(entries: List[str]) -> Callable[[str, int], Optional[str]]:
+    def complete(text: str, state: int) -> Optional[str]:
+        matches = [e for e in entries if e.startswith(text)]
+        return matches[state] if state < len(matches) else None
+    return complete
+
+
+def read_line(message: str, history_key: str) -> str:
+    """
+    Prompt for a line of free text, stripped. With readline available,
+    Up/Down recall and Tab completes earlier answers given under the same
+    history_key, so repeated sections and descriptions need not be retyped.
+    """
+    entries = _PROMPT_HISTORY.setdefault(history_key, [])
+    if readline is None:
+        raw = input(colored_prompt(message)).strip()
+    else:
+        readline.clear_history()
+        for entry in entries:
+            readline.add_history(entry)
+        readline.set_completer(_history_completer(entries))
+        try:
+            raw = input(colored_prompt(message)).strip()
+        finally:
+            readline.set_completer(None)
+    if raw and raw not in entries:
+        entries.append(raw)
+    return raw
+
+
 def prompt_float(message: str, default: Optional[float] = None) -> float:
     while True:
         if default is not None:
@@ -427,6 +608,28 @@ def prompt_float(message: str, default: Optional[float] = None) -> float:
             print("Please enter a number (e.g. 10 or 10.5).")
 
 
+def read_int_in_range(
+    message: str,
+    lo: int,
+    hi: int,
+    invalid_msg: str = "Please enter a valid number.",
+) -> int:
+    """
+    Prompt until the answer is a whole number between lo and hi (inclusive).
+    Non-numbers are rejected by a digit check rather than a raised ValueError.
+    """
+    while True:
+        raw = input(colored_prompt(message)).strip()
+        digits = raw[1:] if raw[:1] in ("-", "+") else raw
+        if not digits.isdecimal():
+            print(invalid_msg)
+            continue
+        n = int(raw)
+        if lo <= n <= hi:
+            return n
+        print("Out of range, try again.")
+
+
 def prompt_yes_no(message: str, default: bool = True) -> bool:
     default_str = "Y/n" if default else "y/N"
     while True:
@@ -460,14 +663,15 @@ def choose_worker_type() -> str:
         print("Invalid choice, please enter 1, 2, 3, or 4.")
 
 
+_DEFAULT_RATES = {
+    "Contractor": 80.0,
+    "Carpenter": 70.0,
+    "Laborer": 55.0,
+}
+
+
 def get_default_rate(worker_type: str) -> float:
-    if worker_type == "Contractor":
-        return 80.0
-    if worker_type == "Carpenter":
-        return 70.0
-    if worker_type == "Laborer":
-        return 55.0
-    return 0.0
+    return _DEFAULT_RATES.get(worker_type, 0.0)
 
 
 def choose_rate(worker_type: str) -> float:
@@ -516,6 +720,25 @@ def prompt_float_keep_current(label: str, current: float) -> float:
             print("Please enter a valid number, or press ENTER to keep current value.")
 
 
+# Editable quote header fields, asked in order. ENTER keeps the current value.
+# (label, input prompt, "meta"/"totals", key, parser, display formatter,
+#  message on bad input, re-ask on bad input?)
+_QUOTE_HEADER_FIELDS = (
+    ("project name", "New project name (ENTER to keep): ", "meta", "project_name",
+     str, str, "", False),
+    ("client name", "New client name (ENTER to keep): ", "meta", "client_name",
+     str, str, "", False),
+    ("project address", "New address (ENTER to keep): ", "meta", "project_address",
+     str, str, "", False),
+    ("document date", "New date (MM-DD-YYYY, ENTER to keep): ", "meta", "doc_date",
+     parse_mmddyyyy, format_date, "Invalid date format. Use MM-DD-YYYY.", True),
+    ("receipts total", "New receipts total (ENTER to keep): ", "totals", "receipts_total",
+     float, "{:,.2f}".format, "Invalid number — keeping current value.", False),
+    ("subtotal", "New subtotal (ENTER to keep): ", "totals", "subtotal",
+     float, "{:,.2f}".format, "Invalid number — keeping current value.", False),
+)
+
+
 def edit_quote_headers_interactive(meta: dict, totals: dict) -> Tuple[dict, dict]:
     """
     Allows editing of the main quote header fields and totals.
@@ -529,53 +752,21 @@ def edit_quote_headers_interactive(meta: dict, totals: dict) -> Tuple[dict, dict
     """
     print(colored_section("\n=== Edit Quote Header Fields ==="))
 
-    # PROJECT NAME
-    print(f"Current project name: {meta['project_name']}")
-    new_val = input(colored_prompt("New project name (ENTER to keep): ")).strip()
-    if new_val:
-        meta["project_name"] = new_val
-
-    # CLIENT NAME
-    print(f"Current client name: {meta['client_name']}")
-    new_val = input(colored_prompt("New client name (ENTER to keep): ")).strip()
-    if new_val:
-        meta["client_name"] = new_val
-
-    # PROJECT ADDRESS
-    print(f"Current project address: {meta['project_address']}")
-    new_val = input(colored_prompt("New address (ENTER to keep): ")).strip()
-    if new_val:
-        meta["project_address"] = new_val
-
-    # DATE
-    print(f"Current document date: {format_date(meta['doc_date'])}")
-    while True:
-        new_val = input(colored_prompt("New date (MM-DD-YYYY, ENTER to keep): ")).strip()
-        if not new_val:
-            break
-        try:
-            meta["doc_date"] = parse_mmddyyyy(new_val)
-            break
-        except ValueError:
-            print("Invalid date format. Use MM-DD-YYYY.")
-
-    # RECEIPTS TOTAL
-    print(f"Current receipts total: {totals.get('receipts_total', 0.0):,.2f}")
-    raw = input(colored_prompt("New receipts total (ENTER to keep): ")).strip()
-    if raw:
-        try:
-            totals["receipts_total"] = float(raw)
-        except ValueError:
-            print("Invalid number — keeping current value.")
-
-    # SUBTOTAL
-    print(f"Current subtotal: {totals.get('subtotal', 0.0):,.2f}")
-    raw = input(colored_prompt("New subtotal (ENTER to keep): ")).strip()
-    if raw:
-        try:
-            totals["subtotal"] = float(raw)
-        except ValueError:
-            print("Invalid number — keeping current value.")
+    targets = {"meta": meta, "totals": totals}
+    for label, prompt, target, key, parse, show, error, retry in _QUOTE_HEADER_FIELDS:
+        values = targets[target]
+        print(f"Current {label}: {show(values.get(key, 0.0))}")
+        while True:
+            raw = input(colored_prompt(prompt)).strip()
+            if not raw:
+                break
+            try:
+                values[key] = parse(raw)
+                break
+            except ValueError:
+                print(error)
+                if not retry:
+                    break
 
     # GRAND TOTAL
     print(f"Current grand total: {totals.get('grand_total', 0.0):,.2f}")
@@ -602,7 +793,7 @@ def compute_totals(
     lines: List[EstimateLine],
     receipts_total: float = 0.0
 ) -> dict:
-    contractor_subtotal = sum(l.total for l in lines)
+    contractor_subtotal = sum([l.total for l in lines])
     grand_total = contractor_subtotal + receipts_total
     return {
         "subtotal": contractor_subtotal,
@@ -631,56 +822,92 @@ def save_document_csv(
     filename = f"{job_id}_{doc_type}_{date_str}.csv"
     path = os.path.join(job_dir, filename)
 
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        writer.writerow(["DocType", doc_type])
-        writer.writerow(["JobID", job_id])
-        writer.writerow(["Project", project_name])
-        writer.writerow(["Client", client_name])
-        writer.writerow(["Address", project_address])
-        writer.writerow(["Date", date_str])
-        writer.writerow(["ReceiptsTotal", totals.get("receipts_total", 0.0)])
-        writer.writerow([])
-        writer.writerow([
-            "Section",
-            "Description",
-            "FullDescription",
-            "WorkerType",
-            "Hours/Qty",
-            "Rate/UnitPrice",
-            "LineTotal",
-        ])
-
-        for line in lines:
-            writer.writerow(
-                [
-                    line.section,
-                    line.description,
-                    line.detail,
-                    line.worker_type,
-                    line.hours,
-                    line.rate,
-                    line.total,
-                ]
-            )
+    # Build the whole document in memory and hand it to the file in one write
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(["DocType", doc_type])
+    writer.writerow(["JobID", job_id])
+    writer.writerow(["Project", project_name])
+    writer.writerow(["Client", client_name])
+    writer.writerow(["Address", project_address])
+    writer.writerow(["Date", date_str])
+    writer.writerow(["ReceiptsTotal", totals.get("receipts_total", 0.0)])
+    writer.writerow([])
+    writer.writerow([
+        "Section",
+        "Description",
+        "FullDescription",
+        "WorkerType",
+        "Hours/Qty",
+        "Rate/UnitPrice",
+        "LineTotal",
+    ])
+
+    for line in lines:
+        writer.writerow(
+            [
+                line.section,
+                line.description,
+                line.detail,
+                line.worker_type,
+                line.hours,
+                line.rate,
+                line.total,
+            ]
+        )
 
+    writer.writerow([])
+    writer.writerow(["Subtotal", "", "", "", "", "", totals["subtotal"]])
+    writer.writerow(["GrandTotal", "", "", "", "", "", totals["grand_total"]])
+
+    if allowances:
         writer.writerow([])
-        writer.writerow(["Subtotal", "", "", "", "", "", totals["subtotal"]])
-        writer.writerow(["GrandTotal", "", "", "", "", "", totals["grand_total"]])
-
-        if allowances:
-            writer.writerow([])
-            writer.writerow(["Owner Allowances (client purchases directly)"])
-            writer.writerow(["Description", "Quantity", "EstUnitCost", "EstTotal"])
-            allowance_total = 0.0
-            for a in allowances:
-                writer.writerow([a.description, a.quantity, a.unit_cost, a.total])
-                allowance_total += a.total
-            writer.writerow(["OwnerAllowancesTotal", "", "", "", allowance_total])
+        writer.writerow(["Owner Allowances (client purchases directly)"])
+        writer.writerow(["Description", "Quantity", "EstUnitCost", "EstTotal"])
+        allowance_total = 0.0
+        for a in allowances:
+            writer.writerow([a.description, a.quantity, a.unit_cost, a.total])
+            allowance_total += a.total
+        writer.writerow(["OwnerAllowancesTotal", "", "", "", allowance_total])
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        f.write(buf.getvalue())
 
+    _invalidate_dir_cache(job_dir)
     return path
 
 
+# CSV header keys that map straight onto a meta field
+_QUOTE_META_KEYS = {
+    "DocType": "doc_type",
+    "JobID": "job_id",
+    "Project": "project_name",
+    "Client": "client_name",
+    "Address": "project_address",
+}
+
+# First-cell values that close the line items table
+_LINE_ITEMS_END = ("Subtotal", "GrandTotal", "Owner Allowances (client purchases directly)")
+
+
+def _clean_row(row: List[str], width: int) -> List[str]:
+    """Strip every cell once and pad the row out to at least `width` cells."""
+    cells = [cell.strip() for cell in row]
+    if len(cells) < width:
+        cells.extend([""] * (width - len(cells)))
+    return cells
+
+
+def _cell_float(raw: str) -> float:
+    """Number in an already-stripped cell; blank or invalid reads as 0.0."""
+    if not raw:
+        return 0.0
+    try:
+        return float(raw)
+    except ValueError:
+        return 0.0
+
+
 def load_quote_from_csv(path: str) -> Tuple[dict, List[EstimateLine], dict, List[OwnerAllowance]]:
     """
     Load an existing QUOTE CSV that was created by save_document_csv.
@@ -699,10 +926,6 @@ def load_quote_from_csv(path: str) -> Tuple[dict, List[EstimateLine], dict, List
         print(f"⚠️ Quote file not found: {path}")
         return {}, [], {}, []
 
-    with open(path, "r", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        rows = list(reader)
-
     meta = {
         "doc_type": "quote",
         "job_id": "",
@@ -719,208 +942,269 @@ def load_quote_from_csv(path: str) -> Tuple[dict, List[EstimateLine], dict, List
     lines: List[EstimateLine] = []
     allowances: List[OwnerAllowance] = []
 
-    i = 0
-    while i < len(rows):
-        row = rows[i]
-        if not row:
-            i += 1
-            continue
-        key = row[0].strip()
-
-        if key == "DocType" and len(row) > 1:
-            meta["doc_type"] = row[1].strip()
-        elif key == "JobID" and len(row) > 1:
-            meta["job_id"] = row[1].strip()
-        elif key == "Project" and len(row) > 1:
-            meta["project_name"] = row[1].strip()
-        elif key == "Client" and len(row) > 1:
-            meta["client_name"] = row[1].strip()
-        elif key == "Address" and len(row) > 1:
-            meta["project_address"] = row[1].strip()
-        elif key == "Date" and len(row) > 1:
-            try:
-                meta["doc_date"] = parse_mmddyyyy(row[1].strip())
-            except ValueError:
-                pass
-        elif key == "ReceiptsTotal" and len(row) > 1:
-            try:
-                totals["receipts_total"] = float(row[1])
-            except (ValueError, TypeError):
-                totals["receipts_total"] = 0.0
-
-        elif key == "Section":
-            # Start of line items table
-            i += 1
-            while i < len(rows):
-                r = rows[i]
-                if (not r) or (r[0].strip() in (
-                    "Subtotal",
-                    "GrandTotal",
-                    "Owner Allowances (client purchases directly)",
-                )):
-                    break
+    # Rows are consumed as they are read; `state` tracks which block we are in.
+    state = "header"
+    with open(path, "r", encoding="utf-8") as f:
+        for row in csv.reader(f):
+            if state == "lines":
+                cells = _clean_row(row, 6)
+                if row and cells[0] not in _LINE_ITEMS_END:
+                    if not any(cells):
+                        continue
+                    section, desc, detail, worker, hours_raw, rate_raw = cells[:6]
+                    lines.append(EstimateLine(
+                        section, desc, worker, _cell_float(hours_raw), _cell_float(rate_raw), detail
+                    ))
+                    continue
+                # End of the line items table; this row belongs to the header/totals
+                state = "header"
 
-                if all(not cell.strip() for cell in r):
-                    i += 1
+            elif state == "allowance_columns":
+                # Column titles under the allowances heading
+                state = "allowances"
+                continue
+
+            elif state == "allowances":
+                if not row:
                     continue
+                desc, qty_raw, unit_raw = _clean_row(row, 3)[:3]
+                if desc == "OwnerAllowancesTotal":
+                    state = "header"
+                    continue
+                allowances.append(OwnerAllowance(desc, _cell_float(qty_raw), _cell_float(unit_raw)))
+                continue
 
-                section = r[0].strip() if len(r) > 0 else ""
-                desc    = r[1].strip() if len(r) > 1 else ""
-                detail  = r[2].strip() if len(r) > 2 else ""
-                worker  = r[3].strip() if len(r) > 3 else ""
+            if not row:
+                continue
+            key = row[0].strip()
+
+            if key in _QUOTE_META_KEYS and len(row) > 1:
+                meta[_QUOTE_META_KEYS[key]] = row[1].strip()
+            elif key == "Date" and len(row) > 1:
                 try:
-                    hours = float(r[4]) if len(r) > 4 and r[4].strip() != "" else 0.0
+                    meta["doc_date"] = parse_mmddyyyy(row[1].strip())
                 except ValueError:
-                    hours = 0.0
+                    pass
+            elif key == "ReceiptsTotal" and len(row) > 1:
                 try:
-                    rate = float(r[5]) if len(r) > 5 and r[5].strip() != "" else 0.0
-                except ValueError:
-                    rate = 0.0
-
-                lines.append(
-                    EstimateLine(
-                        section=section,
-                        description=desc,
-                        worker_type=worker,
-                        hours=hours,
-                        rate=rate,
-                        detail=detail,
-                    )
-                )
-                i += 1
-            continue
-
-        elif key == "Subtotal":
-            try:
-                totals["subtotal"] = float(row[-1])
-            except (ValueError, TypeError):
-                totals["subtotal"] = 0.0
-        elif key == "GrandTotal":
-            try:
-                totals["grand_total"] = float(row[-1])
-            except (ValueError, TypeError):
-                totals["grand_total"] = 0.0
-        elif key == "Owner Allowances (client purchases directly)":
-            i += 2
-            while i < len(rows):
-                r = rows[i]
-                if not r:
-                    i += 1
-                    continue
-                first = r[0].strip()
-                if first == "OwnerAllowancesTotal":
-                    break
-                desc = r[0].strip() if len(r) > 0 else ""
+                    totals["receipts_total"] = float(row[1])
+                except (ValueError, TypeError):
+                    totals["receipts_total"] = 0.0
+            elif key == "Section":
+                state = "lines"
+            elif key == "Subtotal":
                 try:
-                    qty = float(r[1]) if len(r) > 1 and r[1].strip() != "" else 0.0
-                except ValueError:
-                    qty = 0.0
+                    totals["subtotal"] = float(row[-1])
+                except (ValueError, TypeError):
+                    totals["subtotal"] = 0.0
+            elif key == "GrandTotal":
                 try:
-                    unit = float(r[2]) if len(r) > 2 and r[2].strip() != "" else 0.0
-                except ValueError:
-                    unit = 0.0
-                allowances.append(OwnerAllowance(desc, qty, unit))
-                i += 1
-
-        i += 1
+                    totals["grand_total"] = float(row[-1])
+                except (ValueError, TypeError):
+                    totals["grand_total"] = 0.0
+            elif key == "Owner Allowances (client purchases directly)":
+                state = "allowance_columns"
 
     return meta, lines, totals, allowances
 
 
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    Same result as shutil.copy2, but lets the kernel move the bytes with
+    os.copy_file_range where available. Falls back to shutil.copy2, also
+    when the kernel copied fewer bytes than the source holds.
+    """
+    if not hasattr(os, "copy_file_range"):
+        shutil.copy2(src, dst)
+        return
+
+    try:
+        src_fd = os.open(src, os.O_RDONLY)
+        try:
+            size = os.fstat(src_fd).st_size
+            copied = 0
+            dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+            try:
+                while n := os.copy_file_range(src_fd, dst_fd, 1 << 20):
+                    copied += n
+            finally:
+                os.close(dst_fd)
+        finally:
+            os.close(src_fd)
+    except OSError:
+        # Unsupported filesystem / cross-device on older kernels
+        shutil.copy2(src, dst)
+        return
+    if copied != size:
+        # Some FUSE/network mounts and older cross-filesystem copies stop early with 0
+        shutil.copy2(src, dst)
+        return
+    shutil.copystat(src, dst)
+
+
 def backup_original_quote_files(csv_path: str) -> None:
     """
     Create backup copies of the original quote CSV and any matching HTML
     BEFORE writing revised versions.
     """
-    if not os.path.exists(csv_path):
-        return
-
     job_dir = os.path.dirname(csv_path)
     base_name = os.path.basename(csv_path)
     stem, ext = os.path.splitext(base_name)
 
+    # One listing answers every "does this file / backup exist?" question below
+    try:
+        names = {name for name, _, is_file in _cached_listing(job_dir) if is_file}
+    except OSError:
+        return
+    if base_name not in names:
+        return
+
     # Backup CSV
-    backup_csv = os.path.join(job_dir, stem + "_original" + ext)
-    if not os.path.exists(backup_csv):
+    backup_csv_name = stem + "_original" + ext
+    if backup_csv_name not in names:
+        backup_csv = os.path.join(job_dir, backup_csv_name)
         try:
-            shutil.copy2(csv_path, backup_csv)
-            print(colored_section(f"Backup created: {os.path.basename(backup_csv)}"))
+            _fast_copy(csv_path, backup_csv)
+            print(colored_section(f"Backup created: {backup_csv_name}"))
         except Exception as e:
             print(f"⚠️ Could not create CSV backup: {e}")
 
     # Backup matching HTML (same stem prefix)
-    for fname in os.listdir(job_dir):
-        if not fname.lower().endswith(".html"):
-            continue
-        if not fname.startswith(stem):
+    for fname in sorted(names):
+        if not fname.lower().endswith(".html") or not fname.startswith(stem):
             continue
-        html_path = os.path.join(job_dir, fname)
         h_stem, h_ext = os.path.splitext(fname)
-        backup_html = os.path.join(job_dir, h_stem + "_original" + h_ext)
-        if os.path.exists(backup_html):
+        if h_stem.endswith("_original"):
+            continue
+        backup_html_name = h_stem + "_original" + h_ext
+        if backup_html_name in names:
             continue
+        html_path = os.path.join(job_dir, fname)
+        backup_html = os.path.join(job_dir, backup_html_name)
         try:
-            shutil.copy2(html_path, backup_html)
-            print(colored_section(f"Backup created: {os.path.basename(backup_html)}"))
+            _fast_copy(html_path, backup_html)
+            print(colored_section(f"Backup created: {backup_html_name}"))
         except Exception as e:
             print(f"⚠️ Could not create HTML backup for {fname}: {e}")
 
+    _invalidate_dir_cache(job_dir)
 
-def append_receipt_csv(
-    path: str,
-    job_id: str,
-    item_name: str,
-    date_str: str,
-    cost: float,
-) -> str:
-    file_exists = os.path.exists(path)
-    with open(path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["JobID", "Item", "Date", "Cost"])
-        writer.writerow([job_id, item_name, date_str, cost])
-    return path
+
+@contextlib.contextmanager
+def open_receipt_log(path: str, job_id: str) -> Iterator[Callable[[str, str, float], None]]:
+    """
+    Collects the receipts entered during one session.
+    Yields log(item_name, date_str, cost), which queues one row. All rows are
+    appended in a single write when the session ends, also on Ctrl-C or an
+    error, so nothing already entered is lost. The file is only created
+    (with a header) if there is something to write. If the write fails (e.g.
+    the file is open in Excel), the unsaved rows are listed instead of lost.
+    """
+    pending: List[list] = []
+
+    def log(item_name: str, date_str: str, cost: float) -> None:
+        pending.append([job_id, item_name, date_str, cost])
+
+    try:
+        yield log
+    finally:
+        if pending:
+            file_exists = os.path.exists(path)
+            try:
+                with open(path, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.writer(f)
+                    if not file_exists:
+                        writer.writerow(["JobID", "Item", "Date", "Cost"])
+                    writer.writerows(pending)
+            except OSError as e:
+                print(f"⚠️ Could not write receipts to {path}: {e}")
+                print("These receipts were NOT saved; please enter them again:")
+                for _, item_name, date_str, cost in pending:
+                    print(f"  [{date_str}] {item_name} - ${cost}")
+            else:
+                print(f"  ✓ {len(pending)} receipt(s) written to {path}\n")
+            if not file_exists:
+                _invalidate_dir_cache(os.path.dirname(path))
 
 
 # =========================
 #  RECEIPT IMPORT / FILTERING
 # =========================
 
-def load_receipts_data_from_csv(path: str) -> List[dict]:
-    rows: List[dict] = []
-    if not os.path.exists(path):
+def _warn_receipts_unreadable(path: str, err: Exception) -> None:
+    if isinstance(err, FileNotFoundError):
         print(f"⚠️ Receipts file not found: {path}")
-        return rows
+    else:
+        print(f"⚠️ Could not read receipts file: {err}")
+
 
+def load_receipts_data_from_csv(path: str) -> List[dict]:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                rows.append(row)
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
     except Exception as e:
-        print(f"⚠️ Could not read receipts file: {e}")
-        return []
+        _warn_receipts_unreadable(path, e)
+    return []
+
+
+def iter_receipts_from_csv(path: str) -> Iterator[dict]:
+    """
+    Streams receipt rows one at a time, so a filter can keep only what it
+    needs instead of holding the whole file. Read errors propagate to the
+    consumer: a stream cut short must never pass for the whole file.
+    """
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        yield from csv.DictReader(f)
 
-    return rows
+
+def _receipts_file_has_rows(path: str) -> bool:
+    rows = iter_receipts_from_csv(path)
+    try:
+        return next(rows, None) is not None
+    except Exception as e:
+        _warn_receipts_unreadable(path, e)
+        return False
+    finally:
+        rows.close()
 
 
 def _sum_receipt_cost(rows: List[dict]) -> float:
+    # Clean files (every Cost parses) are summed in a single C-level pass;
+    # anything else falls through to the tolerant per-row loop below.
+    try:
+        return sum(map(float, [row.get("Cost") for row in rows]), 0.0)
+    except (TypeError, ValueError):
+        pass
+
     total = 0.0
+    to_float = float
     for row in rows:
         raw_cost = row.get("Cost")
         if raw_cost is None and row:
-            raw_cost = list(row.values())[-1]
-        try:
-            total += float(str(raw_cost).strip())
-        except (TypeError, ValueError):
-            continue
+            raw_cost = next(reversed(row.values()))
+        if isinstance(raw_cost, str):
+            # Blank cells are the usual bad value; skip them without raising.
+            # float() already ignores surrounding whitespace.
+            if not raw_cost or raw_cost.isspace():
+                continue
+            try:
+                total += to_float(raw_cost)
+            except ValueError:
+                continue
+        elif isinstance(raw_cost, (int, float)):
+            total += raw_cost
     return total
 
 
-def _filter_receipts_by_date(rows: List[dict]) -> List[dict]:
-    if not rows:
-        return []
+def _receipt_date(row: dict) -> Optional[datetime.date]:
+    """Date of a receipt row, or None if it is missing or not MM-DD-YYYY."""
+    try:
+        return parse_mmddyyyy((row.get("Date") or "").strip())
+    except ValueError:
+        return None
+
 
+def _prompt_receipt_date_range() -> Tuple[datetime.date, datetime.date]:
     print("\nFilter receipts by date range.")
     print("Dates must be in MM-DD-YYYY format.")
     while True:
@@ -935,18 +1219,23 @@ def _filter_receipts_by_date(rows: List[dict]) -> List[dict]:
         if end_date < start_date:
             print("End date is before start date. Please try again.\n")
             continue
-        break
+        return start_date, end_date
+
+
+def _filter_receipts_by_date(
+    rows: Iterable[dict],
+    start_date: datetime.date,
+    end_date: datetime.date,
+) -> List[dict]:
+    """Keeps rows dated within [start_date, end_date]; works on a stream of rows."""
+    return [
+        row for row in rows
+        if (d := _receipt_date(row)) is not None and start_date <= d <= end_date
+    ]
 
-    filtered: List[dict] = []
-    for row in rows:
-        date_str = (row.get("Date") or "").strip()
-        try:
-            d = parse_mmddyyyy(date_str)
-        except ValueError:
-            continue
-        if start_date <= d <= end_date:
-            filtered.append(row)
-    return filtered
+
+# One receipt selection part: "3" or "5-7", surrounding blanks allowed
+_SEL_RE = re.compile(r"\s*(\d+)\s*(?:-\s*(\d+)\s*)?")
 
 
 def _filter_receipts_by_lines(rows: List[dict]) -> List[dict]:
@@ -966,33 +1255,18 @@ def _filter_receipts_by_lines(rows: List[dict]) -> List[dict]:
     if not selection:
         return []
 
+    # Malformed parts are skipped; ranges are clipped to the rows that exist
+    n = len(rows)
     indices: set[int] = set()
     for part in selection.split(","):
-        part = part.strip()
-        if not part:
+        m = _SEL_RE.fullmatch(part)
+        if not m:
             continue
-        if "-" in part:
-            try:
-                start_s, end_s = part.split("-", 1)
-                start_i = int(start_s)
-                end_i = int(end_s)
-                if start_i <= end_i:
-                    for i in range(start_i, end_i + 1):
-                        indices.add(i)
-            except ValueError:
-                continue
-        else:
-            try:
-                i = int(part)
-                indices.add(i)
-            except ValueError:
-                continue
+        start_i = int(m.group(1))
+        end_i = int(m.group(2)) if m.group(2) else start_i
+        indices.update(range(max(start_i, 1), min(end_i, n) + 1))
 
-    filtered: List[dict] = []
-    for i in sorted(indices):
-        if 1 <= i <= len(rows):
-            filtered.append(rows[i - 1])
-    return filtered
+    return [rows[i - 1] for i in sorted(indices)]
 
 
 def choose_receipts_for_invoice(job_dir: str, job_id: str) -> Tuple[List[dict], float]:
@@ -1007,8 +1281,7 @@ def choose_receipts_for_invoice(job_dir: str, job_id: str) -> Tuple[List[dict],
         return [], 0.0
 
     print(f"\nReading receipts from: {receipts_path}")
-    rows = load_receipts_data_from_csv(receipts_path)
-    if not rows:
+    if not _receipts_file_has_rows(receipts_path):
         print("⚠️ No receipt data found in that file. Continuing without receipts.")
         return [], 0.0
 
@@ -1023,11 +1296,24 @@ def choose_receipts_for_invoice(job_dir: str, job_id: str) -> Tuple[List[dict],
         print("Invalid choice. Please enter 1, 2, or 3.")
 
     if choice == "2":
-        rows_filtered = _filter_receipts_by_date(rows)
-    elif choice == "3":
-        rows_filtered = _filter_receipts_by_lines(rows)
+        # Dates first, then stream the file: only matching rows are kept in memory
+        start_date, end_date = _prompt_receipt_date_range()
+        try:
+            rows_filtered = _filter_receipts_by_date(
+                iter_receipts_from_csv(receipts_path), start_date, end_date
+            )
+        except Exception as e:
+            # Same outcome as an unreadable file when loaded whole: bill no receipts
+            _warn_receipts_unreadable(receipts_path, e)
+            print("⚠️ No receipt data found in that file. Continuing without receipts.")
+            return [], 0.0
     else:
-        rows_filtered = rows
+        # "All" and "pick line numbers" need every row (the latter lists them all)
+        rows = load_receipts_data_from_csv(receipts_path)
+        if not rows:
+            print("⚠️ No receipt data found in that file. Continuing without receipts.")
+            return [], 0.0
+        rows_filtered = _filter_receipts_by_lines(rows) if choice == "3" else rows
 
     if not rows_filtered:
         print("⚠️ No receipts selected. Continuing without receipts.")
@@ -1333,11 +1619,59 @@ $owner_allowance_html
 </html>
 """)
 
+_LOGO_HTML = (
+    f'<img class="logo" src="{_escape(COMPANY_LOGO_FILENAME)}" alt="Logo">' if _LOGO_SOURCE else ""
+)
 
-def render_estimate_html(
-    job_id: str,
-    doc_type: str,
-    project_name: str,
+
+def _presplit_template(template: Template, constants: Dict[str, str]) -> List[str]:
+    """
+    Splits a template into alternating literal text (even slots) and
+    placeholder names (odd slots). Placeholders found in `constants` are
+    filled in right away and merged into the surrounding literal text.
+    """
+    pieces = re.split(r"\$(\w+)", template.template)
+    parts = [pieces[0]]
+    for i in range(1, len(pieces), 2):
+        name, literal = pieces[i], pieces[i + 1]
+        if name in constants:
+            parts[-1] += constants[name] + literal
+        else:
+            parts += [name, literal]
+    return parts
+
+
+# Company block and logo never change between documents, so they are baked in here
+_HTML_PARTS = _presplit_template(HTML_TEMPLATE, dict(_COMPANY_FIELDS, logo_html=_LOGO_HTML))
+
+
+def _fill_html_template(fields: Dict[str, str]) -> str:
+    """
+    Same result as HTML_TEMPLATE.substitute(fields) plus the company/logo
+    constants, without rescanning the template text on every render.
+    """
+    parts = _HTML_PARTS[:]
+    parts[1::2] = [fields[name] for name in _HTML_PARTS[1::2]]
+    return "".join(parts)
+
+
+# Table row formatters, bound once: (section) and (desc, worker, hours, rate, total)
+_SECTION_ROW_FMT = '<tr class="section-row"><td colspan="5">{}</td></tr>'.format
+_LINE_ROW_FMT = (
+    '<tr><td>{}</td><td>{}</td>'
+    '<td class="num">{}</td><td class="num">{}</td><td class="num">{}</td></tr>'
+).format
+# (description, quantity, unit_cost, total); numbers are formatted by the template
+_ALLOWANCE_ROW_FMT = (
+    '<tr><td>{}</td><td class="num">{:.2f}</td>'
+    '<td class="num">${:,.2f}</td><td class="num">${:,.2f}</td></tr>'
+).format
+
+
+def render_estimate_html(
+    job_id: str,
+    doc_type: str,
+    project_name: str,
     project_address: str,
     client_name: str,
     lines: List[EstimateLine],
@@ -1348,10 +1682,6 @@ def render_estimate_html(
     hide_line_prices: bool = False,
 ) -> str:
     date_long = format_date(doc_date)
-    if COMPANY_LOGO_FILENAME and os.path.exists(COMPANY_LOGO_FILENAME):
-        logo_html = f'<img class="logo" src="{COMPANY_LOGO_FILENAME}" alt="Logo">'
-    else:
-        logo_html = ""
 
     if doc_type == "quote":
         title_text = "Quote"
@@ -1360,59 +1690,57 @@ def render_estimate_html(
         title_text = "Invoice"
         summary_label = "Amount Due"
 
-    row_html_list = []
+    # Rows stream into one buffer instead of a list of strings joined afterwards
+    rows_buf = io.StringIO()
+    write = rows_buf.write
+    escape = _escape
+    is_quote = doc_type == "quote"
     last_section = None
     for line in lines:
-        if line.section and line.section != last_section:
-            row_html_list.append(
-                f"""
-        <tr class="section-row">
-            <td colspan="5">{line.section}</td>
-        </tr>
-        """
-            )
-            last_section = line.section
+        section, worker_type, detail = line.section, line.worker_type, line.detail
+        if section and section != last_section:
+            write(_SECTION_ROW_FMT(escape(section)))
+            write("\n        ")
+            last_section = section
 
         if hide_line_prices:
             hours_str = ""
             rate_str = ""
             total_str = ""
         else:
-            if doc_type == "quote" and line.worker_type.lower() == "labor":
+            if is_quote and worker_type.lower() == "labor":
                 hours_str = ""
                 rate_str = ""
             else:
-                hours_str = f"{line.hours:.2f}" if line.hours != 0 else ""
-                rate_str = f"${line.rate:,.2f}" if line.rate != 0 else ""
-            total_str = f"${line.total:,.2f}" if line.total != 0 else ""
-
-        if doc_type == "quote" and line.detail.strip():
-            desc_html = f'{line.description}<div class="line-detail">{line.detail}</div>'
+                hours, rate = line.hours, line.rate
+                hours_str = f"{hours:.2f}" if hours else ""
+                rate_str = f"${rate:,.2f}" if rate else ""
+            total = line.total
+            total_str = f"${total:,.2f}" if total else ""
+
+        # Everything typed by the user is escaped before it lands in markup
+        if is_quote and detail.strip():
+            desc_html = f'{escape(line.description)}<div class="line-detail">{escape(detail)}</div>'
         else:
-            desc_html = line.description
+            desc_html = escape(line.description)
 
-        row_html_list.append(
-            f"""
-        <tr>
-            <td>{desc_html}</td>
-            <td>{line.worker_type}</td>
-            <td class="num">{hours_str}</td>
-            <td class="num">{rate_str}</td>
-            <td class="num">{total_str}</td>
-        </tr>
-        """
-        )
-    table_rows = "\n".join(row_html_list)
+        write(_LINE_ROW_FMT(desc_html, escape(worker_type), hours_str, rate_str, total_str))
+        write("\n        ")
+    table_rows = rows_buf.getvalue()
 
     receipt_rows = receipt_rows or []
     if doc_type == "invoice" and receipt_rows:
-        headers = list(receipt_rows[0].keys())
-        header_cells = "".join(f"<th>{h}</th>" for h in headers)
-        body_rows = []
+        headers = tuple(receipt_rows[0])
+        header_cells = "".join(f"<th>{_escape(str(h))}</th>" for h in headers)
+
+        # One row template per table, sized to this file's columns
+        receipt_row_fmt = ("<tr>" + "<td>{}</td>" * len(headers) + "</tr>\n").format
+        body_buf = io.StringIO()
+        write = body_buf.write
         for r in receipt_rows:
-            cells = "".join(f"<td>{r.get(h, '')}</td>" for h in headers)
-            body_rows.append(f"<tr>{cells}</tr>")
-        body_html = "\n".join(body_rows)
+            get = r.get
+            write(receipt_row_fmt(*[escape(str(get(h, ""))) for h in headers]))
+        body_html = body_buf.getvalue()
         receipt_section_html = f"""
 <div class="receipt-section">
     <div class="receipt-title">Receipts</div>
@@ -1441,22 +1769,15 @@ def render_estimate_html(
         receipts_row_html = ""
 
     if allowances:
-        allowance_rows = []
+        allowance_buf = io.StringIO()
+        write = allowance_buf.write
         total_allowances = 0.0
         for a in allowances:
-            allowance_rows.append(
-                f"""
-            <tr>
-                <td>{a.description}</td>
-                <td class="num">{a.quantity:.2f}</td>
-                <td class="num">${a.unit_cost:,.2f}</td>
-                <td class="num">${a.total:,.2f}</td>
-            </tr>
-            """
-            )
+            write(_ALLOWANCE_ROW_FMT(escape(a.description), a.quantity, a.unit_cost, a.total))
+            write("\n            ")
             total_allowances += a.total
 
-        allowance_rows_html = "\n".join(allowance_rows)
+        allowance_rows_html = allowance_buf.getvalue()
         owner_allowance_html = f"""
 <div class="allowances">
     <div class="allowances-title">Owner Allowances (items client pays for directly)</div>
@@ -1482,18 +1803,12 @@ def render_estimate_html(
     else:
         owner_allowance_html = ""
 
-    html = HTML_TEMPLATE.substitute(
+    html = _fill_html_template(dict(
         title_text=title_text,
-        project_name=project_name,
-        project_address=project_address,
-        client_name=client_name,
-        job_id=job_id,
-        logo_html=logo_html,
-        company_name=COMPANY_NAME,
-        company_city_line=COMPANY_CITY_LINE,
-        company_phone=COMPANY_PHONE,
-        company_email=COMPANY_EMAIL,
-        company_license=COMPANY_LICENSE,
+        project_name=_escape(project_name),
+        project_address=_escape(project_address),
+        client_name=_escape(client_name),
+        job_id=_escape(job_id),
         summary_label=summary_label,
         date_long=date_long,
         subtotal_fmt=f"${totals['subtotal']:,.2f}",
@@ -1502,7 +1817,7 @@ def render_estimate_html(
         owner_allowance_html=owner_allowance_html,
         receipts_row_html=receipts_row_html,
         receipt_section_html=receipt_section_html,
-    )
+    ))
     return html
 
 
@@ -1518,25 +1833,105 @@ def save_estimate_html(
     filename = f"{job_id}_{doc_type}_{sanitize_name(project_name)}_{date_str}.html"
     path = os.path.join(job_dir, filename)
 
-    if COMPANY_LOGO_FILENAME:
-        logo_source = os.path.abspath(COMPANY_LOGO_FILENAME)
-        if os.path.exists(logo_source):
-            logo_dest = os.path.join(job_dir, os.path.basename(COMPANY_LOGO_FILENAME))
-            if not os.path.exists(logo_dest):
-                try:
-                    shutil.copy2(logo_source, logo_dest)
-                except Exception as e:
-                    print(f"⚠️ Could not copy logo to job folder: {e}")
-
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(html)
+    if _LOGO_SOURCE:
+        logo_dest = os.path.join(job_dir, os.path.basename(_LOGO_SOURCE))
+        try:
+            # A hard link is a single directory entry, no image bytes copied
+            os.link(_LOGO_SOURCE, logo_dest)
+        except FileExistsError:
+            pass
+        except OSError:
+            # No hard links here (FAT/exFAT, cross-device, some sync folders).
+            # Claim the name exclusively, then let the kernel copy the bytes.
+            try:
+                open(logo_dest, "xb").close()
+                _fast_copy(_LOGO_SOURCE, logo_dest)
+            except FileExistsError:
+                pass
+            except Exception as e:
+                # Don't leave the empty placeholder behind: later renders would
+                # see it as an existing logo and never retry the copy
+                with contextlib.suppress(OSError):
+                    os.unlink(logo_dest)
+                print(f"⚠️ Could not copy logo to job folder: {e}")
+
+    # Encoded up front and handed to the OS in a single write
+    with open(path, "wb") as f:
+        f.write(html.encode("utf-8"))
+    _invalidate_dir_cache(job_dir)
     return path
 
 
+def write_document_bundle(
+    job_dir: str,
+    job_id: str,
+    doc_type: str,
+    project_name: str,
+    project_address: str,
+    client_name: str,
+    lines: List[EstimateLine],
+    totals: dict,
+    allowances: List[OwnerAllowance],
+    doc_date: datetime.date,
+    receipt_rows: Optional[List[dict]] = None,
+    hide_line_prices: bool = False,
+) -> Tuple[str, str]:
+    """
+    Writes the CSV record and the printable HTML for one document.
+    Each file is built in memory and written with a single call.
+    Returns (csv_path, html_path).
+    """
+    csv_path = save_document_csv(
+        job_dir=job_dir,
+        job_id=job_id,
+        doc_type=doc_type,
+        project_name=project_name,
+        project_address=project_address,
+        client_name=client_name,
+        lines=lines,
+        totals=totals,
+        allowances=allowances,
+        doc_date=doc_date,
+    )
+    html_str = render_estimate_html(
+        job_id=job_id,
+        doc_type=doc_type,
+        project_name=project_name,
+        project_address=project_address,
+        client_name=client_name,
+        lines=lines,
+        totals=totals,
+        allowances=allowances,
+        doc_date=doc_date,
+        receipt_rows=receipt_rows,
+        hide_line_prices=hide_line_prices,
+    )
+    html_path = save_estimate_html(
+        job_dir=job_dir,
+        job_id=job_id,
+        doc_type=doc_type,
+        project_name=project_name,
+        html=html_str,
+        doc_date=doc_date,
+    )
+    return csv_path, html_path
+
+
 # =========================
 #  SECTION OVERVIEW & REORDER
 # =========================
 
+def _group_lines_by_section(lines: List[EstimateLine]) -> Dict[str, List[EstimateLine]]:
+    """
+    Buckets lines by section in one pass. Dict order is the order each
+    section first appears; lines keep their relative order.
+    """
+    by_section: Dict[str, List[EstimateLine]] = {}
+    for line in lines:
+        by_section.setdefault(line.section or "", []).append(line)
+    return by_section
+
+
 def show_sections_overview(lines: List[EstimateLine]) -> None:
     """
     Print a grouped overview by section in current order.
@@ -1545,19 +1940,12 @@ def show_sections_overview(lines: List[EstimateLine]) -> None:
         print("No line items.")
         return
 
-    section_order: List[str] = []
-    for l in lines:
-        key = l.section or ""
-        if key not in section_order:
-            section_order.append(key)
-
     print(colored_section("\nCurrent section overview (in order):"))
-    for idx, sec in enumerate(section_order, start=1):
+    for idx, (sec, sec_lines) in enumerate(_group_lines_by_section(lines).items(), start=1):
         label = sec if sec else "[No Section]"
         print(f"\n  {idx}. {label}")
-        for line in lines:
-            if (line.section or "") == sec:
-                print(f"     - {line.description} ({line.worker_type})")
+        for line in sec_lines:
+            print(f"     - {line.description} ({line.worker_type})")
 
 
 def reorder_sections_interactive(lines: List[EstimateLine]) -> List[EstimateLine]:
@@ -1568,11 +1956,8 @@ def reorder_sections_interactive(lines: List[EstimateLine]) -> List[EstimateLine
     if not lines:
         return lines
 
-    section_order: List[str] = []
-    for l in lines:
-        key = l.section or ""
-        if key not in section_order:
-            section_order.append(key)
+    by_section = _group_lines_by_section(lines)
+    section_order = list(by_section)
 
     if len(section_order) <= 1:
         return lines
@@ -1615,14 +2000,9 @@ def reorder_sections_interactive(lines: List[EstimateLine]) -> List[EstimateLine
 
     new_section_order = [section_order[i - 1] for i in indices]
 
-    by_section = {sec: [] for sec in section_order}
-    for l in lines:
-        key = l.section or ""
-        by_section[key].append(l)
-
     new_lines: List[EstimateLine] = []
     for sec in new_section_order:
-        new_lines.extend(by_section.get(sec, []))
+        new_lines.extend(by_section[sec])
 
     print(colored_section("\nSections have been reordered.\n"))
     show_sections_overview(new_lines)
@@ -1634,212 +2014,242 @@ def reorder_sections_interactive(lines: List[EstimateLine]) -> List[EstimateLine
 #  BUILD LINE ITEMS
 # =========================
 
-def build_quote_lines() -> List[EstimateLine]:
-    """
-    QUOTES (standard pricing)
-    """
-    lines: List[EstimateLine] = []
-    current_section = ""
+# Menus printed on every pass of the line-entry loops, assembled once
+_QUOTE_LINES_MENU = "\n".join([
+    colored_section("\nMenu:"),
+    "  1. Set / Change Section Heading",
+    "  2. Add Labor Line (fixed amount)",
+    "  3. Add Material Line",
+    "  4. Done adding quote items",
+])
+_INVOICE_LINES_MENU = "\n".join([
+    colored_section("\nMenu:"),
+    "  1. Set / Change Section Heading",
+    "  2. Add Labor Line (with rate)",
+    "  3. Add Material Line",
+    "  4. Done adding invoice items",
+])
+_SCOPE_LINES_MENU = "\n".join([
+    colored_section("Menu:"),
+    "  1. Set / Change Section Heading",
+    "  2. Add Scope Line",
+    "  3. Done adding scope items",
+])
+
+# A line action prompts for one line in the given section; None means nothing was added
+LineAction = Callable[[str], Optional[EstimateLine]]
+
+
+def _add_quote_labor_line(section: str) -> Optional[EstimateLine]:
+    print("\nLabor (fixed amount for quote)")
+    desc = read_line("Scope item / short label: ", "description")
+    if not desc:
+        print("Description required.")
+        return None
+    full_desc = read_line("Detailed description for quote (shows under the line item): ", "detail")
+    total_amount = prompt_float("Total labor amount for this item")
+
+    worker_label = choose_quote_worker_label()
+
+    line = EstimateLine(
+        section=section,
+        description=desc,
+        worker_type=worker_label,
+        hours=1.0,
+        rate=total_amount,
+        detail=full_desc,
+    )
+    print(f"  Added labor line: {desc} | Label = {worker_label} | Amount = ${line.total:,.2f}\n")
+    return line
 
-    print(colored_section("\nAdd Quote Line Items (Standard Pricing)."))
-    print("You can create section headings (e.g. 'Interior Paint', 'Framing & Demo').")
 
-    while True:
-        print(colored_section("\nMenu:"))
-        print("  1. Set / Change Section Heading")
-        print("  2. Add Labor Line (fixed amount)")
-        print("  3. Add Material Line")
-        print("  4. Done adding quote items")
-        choice = input(colored_prompt("Choice (1–4): ")).strip()
+def _add_quote_material_line(section: str) -> Optional[EstimateLine]:
+    print("\nMaterial item (quote)")
+    desc = read_line("Scope item / short label (e.g. tile, lumber, fixtures): ", "description")
+    if not desc:
+        print("Description required.")
+        return None
+    full_desc = read_line("Detailed description for this material line (optional): ", "detail")
+    qty = prompt_float("Quantity")
+    price = prompt_float("Unit price ($)")
+
+    worker_label = choose_quote_worker_label()
+
+    line = EstimateLine(
+        section=section,
+        description=desc,
+        worker_type=worker_label,
+        hours=qty,
+        rate=price,
+        detail=full_desc,
+    )
+    print(f"  Added material line: {desc} | Label = {worker_label} | {qty} @ ${price:.2f} = ${line.total:,.2f}\n")
+    return line
 
-        if choice == "1":
-            section_name = input(colored_prompt("Section name (e.g. Interior Painting): ")).strip()
-            current_section = section_name
-            print(f"Current section set to: {current_section or '(none)'}")
 
-        elif choice == "2":
-            print("\nLabor (fixed amount for quote)")
-            desc = input(colored_prompt("Scope item / short label: ")).strip()
-            if not desc:
-                print("Description required.")
-                continue
-            full_desc = input(
-                colored_prompt("Detailed description for quote (shows under the line item): ")
-            ).strip()
-            total_amount = prompt_float("Total labor amount for this item")
-
-            worker_label = choose_quote_worker_label()
-
-            line = EstimateLine(
-                section=current_section,
-                description=desc,
-                worker_type=worker_label,
-                hours=1.0,
-                rate=total_amount,
-                detail=full_desc,
-            )
-            lines.append(line)
-            print(f"  Added labor line: {desc} | Label = {worker_label} | Amount = ${line.total:,.2f}\n")
-
-        elif choice == "3":
-            print("\nMaterial item (quote)")
-            desc = input(colored_prompt("Scope item / short label (e.g. tile, lumber, fixtures): ")).strip()
-            if not desc:
-                print("Description required.")
-                continue
-            full_desc = input(
-                colored_prompt("Detailed description for this material line (optional): ")
-            ).strip()
-            qty = prompt_float("Quantity")
-            price = prompt_float("Unit price ($)")
-
-            worker_label = choose_quote_worker_label()
-
-            line = EstimateLine(
-                section=current_section,
-                description=desc,
-                worker_type=worker_label,
-                hours=qty,
-                rate=price,
-                detail=full_desc,
-            )
-            lines.append(line)
-            print(f"  Added material line: {desc} | Label = {worker_label} | {qty} @ ${price:.2f} = ${line.total:,.2f}\n")
+def _add_invoice_labor_line(section: str) -> Optional[EstimateLine]:
+    print("\nLabor (invoice)")
+    desc = read_line("Scope / description (e.g. Demo, Framing): ", "description")
+    if not desc:
+        print("Description required.")
+        return None
+    worker_type = choose_worker_type()
+    rate = choose_rate(worker_type)
+    hours = prompt_float("Hours for this line item")
+    line = EstimateLine(
+        section=section,
+        description=desc,
+        worker_type=worker_type,
+        hours=hours,
+        rate=rate,
+    )
+    print(
+        f"  Added labor: {desc} | {worker_type} | "
+        f"{hours:.2f} hrs @ ${rate:.2f}/hr = ${line.total:,.2f}\n"
+    )
+    return line
 
-        elif choice == "4":
-            break
-        else:
-            print("Invalid choice, please enter 1, 2, 3, or 4.")
 
-    lines = reorder_sections_interactive(lines)
-    return lines
+def _add_invoice_material_line(section: str) -> Optional[EstimateLine]:
+    print("\nMaterial item (invoice)")
+    desc = read_line("Scope / description (e.g. lumber, drywall, tile): ", "description")
+    if not desc:
+        print("Description required.")
+        return None
+    qty = prompt_float("Quantity")
+    price = prompt_float("Unit price ($)")
+    line = EstimateLine(
+        section=section,
+        description=desc,
+        worker_type="Material",
+        hours=qty,
+        rate=price,
+    )
+    print(f"  Added material: {desc} | {qty} @ ${price:.2f} = ${line.total:,.2f}\n")
+    return line
 
 
-def build_invoice_lines() -> List[EstimateLine]:
+def _add_scope_line(section: str, with_detail: bool) -> Optional[EstimateLine]:
+    desc = read_line("Scope item / short label (or ENTER to finish): ", "description")
+    if not desc:
+        return None
+
+    worker_label = choose_quote_worker_label()
+
+    if with_detail:
+        detail = read_line("  Detailed description for quote (optional): ", "detail")
+    else:
+        detail = ""
+
+    line = EstimateLine(
+        section=section,
+        description=desc,
+        worker_type=worker_label,
+        hours=0.0,
+        rate=0.0,
+        detail=detail,
+    )
+    print(f"  Added scope-only line: {desc} ({worker_label})\n")
+    return line
+
+
+_QUOTE_LINE_ACTIONS: Dict[str, LineAction] = {
+    "2": _add_quote_labor_line,
+    "3": _add_quote_material_line,
+}
+_INVOICE_LINE_ACTIONS: Dict[str, LineAction] = {
+    "2": _add_invoice_labor_line,
+    "3": _add_invoice_material_line,
+}
+
+
+def _line_entry_loop(
+    menu: str,
+    choice_prompt: str,
+    section_prompt: str,
+    actions: Dict[str, LineAction],
+    done_choice: str,
+    invalid_msg: str,
+) -> List[EstimateLine]:
     """
-    INVOICES (Time & Materials)
+    Shared menu loop for the build_* functions: "1" sets the section heading,
+    `actions` maps the remaining choices to line prompts, `done_choice` ends
+    entry. Sections can be reordered before the lines are returned.
     """
     lines: List[EstimateLine] = []
     current_section = ""
 
-    print(colored_section("\nAdd Invoice Line Items (Time & Materials)."))
-    print("You can create section headings (e.g. 'Interior Painting', 'Framing & Demo').")
-
     while True:
-        print(colored_section("\nMenu:"))
-        print("  1. Set / Change Section Heading")
-        print("  2. Add Labor Line (with rate)")
-        print("  3. Add Material Line")
-        print("  4. Done adding invoice items")
-        choice = input(colored_prompt("Choice (1–4): ")).strip()
-
-        if choice == "1":
-            section_name = input(colored_prompt("Section name (e.g. Framing & Demo): ")).strip()
-            current_section = section_name
+        print(menu)
+        choice = input(colored_prompt(choice_prompt)).strip()
+
+        action = actions.get(choice)
+        if action is not None:
+            line = action(current_section)
+            if line is not None:
+                lines.append(line)
+        elif choice == "1":
+            current_section = read_line(section_prompt, "section")
             print(f"Current section set to: {current_section or '(none)'}")
-
-        elif choice == "2":
-            print("\nLabor (invoice)")
-            desc = input(colored_prompt("Scope / description (e.g. Demo, Framing): ")).strip()
-            if not desc:
-                print("Description required.")
-                continue
-            worker_type = choose_worker_type()
-            rate = choose_rate(worker_type)
-            hours = prompt_float("Hours for this line item")
-            line = EstimateLine(
-                section=current_section,
-                description=desc,
-                worker_type=worker_type,
-                hours=hours,
-                rate=rate,
-            )
-            lines.append(line)
-            print(
-                f"  Added labor: {desc} | {worker_type} | "
-                f"{hours:.2f} hrs @ ${rate:.2f}/hr = ${line.total:,.2f}\n"
-            )
-
-        elif choice == "3":
-            print("\nMaterial item (invoice)")
-            desc = input(colored_prompt("Scope / description (e.g. lumber, drywall, tile): ")).strip()
-            if not desc:
-                print("Description required.")
-                continue
-            qty = prompt_float("Quantity")
-            price = prompt_float("Unit price ($)")
-            line = EstimateLine(
-                section=current_section,
-                description=desc,
-                worker_type="Material",
-                hours=qty,
-                rate=price,
-            )
-            lines.append(line)
-            print(f"  Added material: {desc} | {qty} @ ${price:.2f} = ${line.total:,.2f}\n")
-
-        elif choice == "4":
+        elif choice == done_choice:
             break
         else:
-            print("Invalid choice, please enter 1, 2, 3, or 4.")
+            print(invalid_msg)
 
-    lines = reorder_sections_interactive(lines)
-    return lines
+    return reorder_sections_interactive(lines)
 
 
-def build_scope_only_lines(context_label: str) -> List[EstimateLine]:
+def build_quote_lines() -> List[EstimateLine]:
     """
-    For fixed pricing (quote or invoice)
+    QUOTES (standard pricing)
     """
-    lines: List[EstimateLine] = []
-    current_section = ""
+    print(colored_section("\nAdd Quote Line Items (Standard Pricing)."))
+    print("You can create section headings (e.g. 'Interior Paint', 'Framing & Demo').")
 
-    print(colored_section(f"\nAdding scope-only line items for fixed-price {context_label}."))
-    print("You can set section headings like 'Interior Paint', 'Exterior Paint', 'Framing & Demo'.")
-    print("These lines will show scope only, with blank pricing columns.\n")
+    return _line_entry_loop(
+        _QUOTE_LINES_MENU,
+        "Choice (1–4): ",
+        "Section name (e.g. Interior Painting): ",
+        _QUOTE_LINE_ACTIONS,
+        done_choice="4",
+        invalid_msg="Invalid choice, please enter 1, 2, 3, or 4.",
+    )
 
-    while True:
-        print(colored_section("Menu:"))
-        print("  1. Set / Change Section Heading")
-        print("  2. Add Scope Line")
-        print("  3. Done adding scope items")
-        choice = input(colored_prompt("Choice (1–3): ")).strip()
 
-        if choice == "1":
-            section_name = input(colored_prompt("Section name (e.g. Interior Painting): ")).strip()
-            current_section = section_name
-            print(f"Current section set to: {current_section or '(none)'}")
+def build_invoice_lines() -> List[EstimateLine]:
+    """
+    INVOICES (Time & Materials)
+    """
+    print(colored_section("\nAdd Invoice Line Items (Time & Materials)."))
+    print("You can create section headings (e.g. 'Interior Painting', 'Framing & Demo').")
 
-        elif choice == "2":
-            desc = input(colored_prompt("Scope item / short label (or ENTER to finish): ")).strip()
-            if not desc:
-                continue
+    return _line_entry_loop(
+        _INVOICE_LINES_MENU,
+        "Choice (1–4): ",
+        "Section name (e.g. Framing & Demo): ",
+        _INVOICE_LINE_ACTIONS,
+        done_choice="4",
+        invalid_msg="Invalid choice, please enter 1, 2, 3, or 4.",
+    )
 
-            worker_label = choose_quote_worker_label()
 
-            if context_label.lower() == "quote":
-                detail = input(colored_prompt("  Detailed description for quote (optional): ")).strip()
-            else:
-                detail = ""
-
-            line = EstimateLine(
-                section=current_section,
-                description=desc,
-                worker_type=worker_label,
-                hours=0.0,
-                rate=0.0,
-                detail=detail,
-            )
-            lines.append(line)
-            print(f"  Added scope-only line: {desc} ({worker_label})\n")
-
-        elif choice == "3":
-            break
-        else:
-            print("Invalid choice. Please enter 1, 2, or 3.")
+def build_scope_only_lines(context_label: str) -> List[EstimateLine]:
+    """
+    For fixed pricing (quote or invoice)
+    """
+    print(colored_section(f"\nAdding scope-only line items for fixed-price {context_label}."))
+    print("You can set section headings like 'Interior Paint', 'Exterior Paint', 'Framing & Demo'.")
+    print("These lines will show scope only, with blank pricing columns.\n")
 
-    lines = reorder_sections_interactive(lines)
-    return lines
+    with_detail = context_label.lower() == "quote"
+    return _line_entry_loop(
+        _SCOPE_LINES_MENU,
+        "Choice (1–3): ",
+        "Section name (e.g. Interior Painting): ",
+        {"2": lambda section: _add_scope_line(section, with_detail)},
+        done_choice="3",
+        invalid_msg="Invalid choice. Please enter 1, 2, or 3.",
+    )
 
 
 def build_owner_allowances() -> List[OwnerAllowance]:
@@ -1849,7 +2259,7 @@ def build_owner_allowances() -> List[OwnerAllowance]:
     print("Press ENTER on description to finish.\n")
 
     while True:
-        desc = input(colored_prompt("Allowance description (or ENTER to finish): ")).strip()
+        desc = read_line("Allowance description (or ENTER to finish): ", "allowance")
         if not desc:
             break
         qty = prompt_float("Quantity")
@@ -1871,9 +2281,9 @@ def create_quote_or_invoice(doc_type: str) -> None:
     print(colored_header(f"\n=== Create {doc_type.capitalize()} ==="))
     existing_job = input(colored_prompt("Enter existing Job ID (e.g. J0001) or press Enter for new: ")).strip().upper()
 
-    project_name = input(colored_prompt("Project name: ")).strip()
-    client_name = input(colored_prompt("Client name: ")).strip()
-    project_address = input(colored_prompt("Project address (street, city, etc.): ")).strip()
+    project_name = read_line("Project name: ", "project")
+    client_name = read_line("Client name: ", "client")
+    project_address = read_line("Project address (street, city, etc.): ", "address")
 
     if existing_job:
         job_id = existing_job
@@ -1882,52 +2292,44 @@ def create_quote_or_invoice(doc_type: str) -> None:
         if matching_dirs:
             if len(matching_dirs) == 1:
                 job_dir = matching_dirs[0]
-                print(colored_section(f"\nUsing existing job folder: {os.path.basename(job_dir)}"))
+                job_dir_name = os.path.basename(job_dir)
+                print(colored_section(f"\nUsing existing job folder: {job_dir_name}"))
             else:
                 print(colored_section("\nMultiple folders found for this Job ID:"))
-                for idx, d in enumerate(matching_dirs, start=1):
-                    print(f"  {idx}. {os.path.basename(d)}")
+                for idx, name in enumerate(map(os.path.basename, matching_dirs), start=1):
+                    print(f"  {idx}. {name}")
                 print("  0. Create a new folder for this Job ID")
 
-                while True:
-                    choice = input(colored_prompt("Select folder (0–{n}): ".format(n=len(matching_dirs)))).strip()
-                    try:
-                        c = int(choice)
-                    except ValueError:
-                        print("Please enter a valid number.")
-                        continue
-                    if 0 <= c <= len(matching_dirs):
-                        break
-                    print("Out of range, try again.")
+                c = read_int_in_range(f"Select folder (0–{len(matching_dirs)}): ", 0, len(matching_dirs))
 
                 if c == 0:
                     job_dir = get_job_folder(job_id, project_name)
-                    print(colored_section(f"\nCreated new job folder: {os.path.basename(job_dir)}"))
+                    job_dir_name = os.path.basename(job_dir)
+                    print(colored_section(f"\nCreated new job folder: {job_dir_name}"))
                 else:
                     job_dir = matching_dirs[c - 1]
-                    print(colored_section(f"\nUsing existing job folder: {os.path.basename(job_dir)}"))
+                    job_dir_name = os.path.basename(job_dir)
+                    print(colored_section(f"\nUsing existing job folder: {job_dir_name}"))
         else:
             job_dir = get_job_folder(job_id, project_name)
-            print(colored_section(f"\nNo existing folder found for {job_id}. Created new folder: {os.path.basename(job_dir)}"))
+            job_dir_name = os.path.basename(job_dir)
+            print(colored_section(f"\nNo existing folder found for {job_id}. Created new folder: {job_dir_name}"))
 
         show_job_folder_contents(job_dir)
 
     else:
         job_id = get_next_job_id()
         job_dir = get_job_folder(job_id, project_name)
+        job_dir_name = os.path.basename(job_dir)
 
-        if os.listdir(job_dir):
-            print(colored_section(f"\n⚠️ Warning: job folder {os.path.basename(job_dir)} already existed and is not empty."))
+        if _cached_listing(job_dir):
+            print(colored_section(f"\n⚠️ Warning: job folder {job_dir_name} already existed and is not empty."))
             use_existing = prompt_yes_no("Use this existing folder for the new document?", default=True)
             if not use_existing:
-                while True:
-                    job_id = get_next_job_id()
-                    job_dir = get_job_folder(job_id, project_name)
-                    if not os.listdir(job_dir):
-                        break
+                job_id, job_dir = _allocate_empty_job_folder(project_name)
                 print(colored_section(f"Using new empty job folder: {os.path.basename(job_dir)}"))
         else:
-            print(colored_section(f"\nAssigned new Job ID: {job_id} and created folder {os.path.basename(job_dir)}"))
+            print(colored_section(f"\nAssigned new Job ID: {job_id} and created folder {job_dir_name}"))
 
         show_job_folder_contents(job_dir)
 
@@ -2009,7 +2411,7 @@ def create_quote_or_invoice(doc_type: str) -> None:
     else:
         totals = compute_totals(lines, receipts_total=receipts_total)
 
-    csv_path = save_document_csv(
+    csv_path, html_path = write_document_bundle(
         job_dir=job_dir,
         job_id=job_id,
         doc_type=doc_type,
@@ -2020,29 +2422,9 @@ def create_quote_or_invoice(doc_type: str) -> None:
         totals=totals,
         allowances=allowances,
         doc_date=doc_date,
-    )
-
-    html_str = render_estimate_html(
-        job_id=job_id,
-        doc_type=doc_type,
-        project_name=project_name,
-        project_address=project_address,
-        client_name=client_name,
-        lines=lines,
-        totals=totals,
-        allowances=allowances,
-        doc_date=doc_date,
         receipt_rows=receipt_rows,
         hide_line_prices=hide_line_prices,
     )
-    html_path = save_estimate_html(
-        job_dir=job_dir,
-        job_id=job_id,
-        doc_type=doc_type,
-        project_name=project_name,
-        html=html_str,
-        doc_date=doc_date,
-    )
 
     print(f"\nSaved {doc_type} CSV:   {csv_path}")
     print(f"Saved {doc_type} HTML:  {html_path}")
@@ -2066,47 +2448,33 @@ def edit_existing_quote() -> None:
         print(colored_section(f"Using job folder: {os.path.basename(job_dir)}"))
     else:
         print(colored_section("\nMultiple folders found for this Job ID:"))
-        for idx, d in enumerate(matching_dirs, start=1):
-            print(f"  {idx}. {os.path.basename(d)}")
-        while True:
-            raw = input(colored_prompt(f"Select folder (1–{len(matching_dirs)}): ")).strip()
-            try:
-                i = int(raw)
-            except ValueError:
-                print("Please enter a number.")
-                continue
-            if 1 <= i <= len(matching_dirs):
-                job_dir = matching_dirs[i - 1]
-                break
-            print("Out of range, try again.")
+        for idx, name in enumerate(map(os.path.basename, matching_dirs), start=1):
+            print(f"  {idx}. {name}")
+        i = read_int_in_range(
+            f"Select folder (1–{len(matching_dirs)}): ", 1, len(matching_dirs),
+            invalid_msg="Please enter a number.",
+        )
+        job_dir = matching_dirs[i - 1]
 
-    quote_files = [
-        f for f in os.listdir(job_dir)
-        if os.path.isfile(os.path.join(job_dir, f))
-        and f.lower().endswith(".csv")
-        and "_quote_" in f.lower()
-    ]
+    # One cached scan; file type comes from the directory entry, no stat per name
+    quote_files = sorted(
+        name for name, _, is_file in _cached_listing(job_dir)
+        if is_file and (lower := name.lower()).endswith(".csv") and "_quote_" in lower
+    )
 
     if not quote_files:
         print("No quote CSV files found in this job folder.")
         return
 
-    quote_files = sorted(quote_files)
     print(colored_section("\nQuote files:"))
     for idx, fname in enumerate(quote_files, start=1):
         print(f"  {idx}. {fname}")
 
-    while True:
-        raw = input(colored_prompt(f"Select quote to edit (1–{len(quote_files)}): ")).strip()
-        try:
-            i = int(raw)
-        except ValueError:
-            print("Please enter a number.")
-            continue
-        if 1 <= i <= len(quote_files):
-            csv_name = quote_files[i - 1]
-            break
-        print("Out of range, try again.")
+    i = read_int_in_range(
+        f"Select quote to edit (1–{len(quote_files)}): ", 1, len(quote_files),
+        invalid_msg="Please enter a number.",
+    )
+    csv_name = quote_files[i - 1]
 
     csv_path = os.path.join(job_dir, csv_name)
     print(colored_section(f"\nLoading quote: {csv_name}"))
@@ -2134,7 +2502,8 @@ def edit_existing_quote() -> None:
 
     meta, totals = edit_quote_headers_interactive(meta, totals)
 
-    hide_line_prices = all((l.hours == 0 and l.rate == 0) for l in lines)
+    # Scope-only quotes carry no hours or rates; stop at the first priced line
+    hide_line_prices = not any(l.hours or l.rate for l in lines)
 
     job_id = meta.get("job_id") or job_id
     project_name = meta["project_name"]
@@ -2142,7 +2511,7 @@ def edit_existing_quote() -> None:
     client_name = meta["client_name"]
     doc_date = meta["doc_date"]
 
-    new_csv_path = save_document_csv(
+    new_csv_path, new_html_path = write_document_bundle(
         job_dir=job_dir,
         job_id=job_id,
         doc_type="quote",
@@ -2153,29 +2522,8 @@ def edit_existing_quote() -> None:
         totals=totals,
         allowances=allowances,
         doc_date=doc_date,
-    )
-
-    html_str = render_estimate_html(
-        job_id=job_id,
-        doc_type="quote",
-        project_name=project_name,
-        project_address=project_address,
-        client_name=client_name,
-        lines=lines,
-        totals=totals,
-        allowances=allowances,
-        doc_date=doc_date,
-        receipt_rows=None,
         hide_line_prices=hide_line_prices,
     )
-    new_html_path = save_estimate_html(
-        job_dir=job_dir,
-        job_id=job_id,
-        doc_type="quote",
-        project_name=project_name,
-        html=html_str,
-        doc_date=doc_date,
-    )
 
     print(colored_section("\nHow would you like to name the updated files?"))
     print("  1. Mark as REVISED (adds _revised before extension)")
@@ -2188,6 +2536,7 @@ def edit_existing_quote() -> None:
         new_path = base + suffix + ext
         try:
             os.replace(path, new_path)
+            _invalidate_dir_cache(os.path.dirname(path))
             return new_path
         except OSError:
             return path
@@ -2218,29 +2567,30 @@ def log_receipts_loop_for_job(job_dir: str, job_id: str) -> None:
     receipts_path = choose_receipt_file_for_logging(job_dir, job_id)
     print(colored_section(f"\nLogging receipts to: {receipts_path}"))
 
-    while True:
-        if not prompt_yes_no("Add a receipt?", default=True):
-            break
+    with open_receipt_log(receipts_path, job_id) as log_row:
+        while True:
+            if not prompt_yes_no("Add a receipt?", default=True):
+                break
 
-        item_name = input(colored_prompt("Item / vendor / brief description: ")).strip()
-        if not item_name:
-            print("Description cannot be blank.")
-            continue
+            item_name = read_line("Item / vendor / brief description: ", "receipt_item")
+            if not item_name:
+                print("Description cannot be blank.")
+                continue
 
-        date_str_input = input(colored_prompt("Receipt date (MM-DD-YYYY, blank for today): ")).strip()
-        if date_str_input:
-            try:
-                _ = parse_mmddyyyy(date_str_input)
-                date_str = date_str_input
-            except ValueError:
-                print("Invalid date format. Using today instead.")
+            date_str_input = input(colored_prompt("Receipt date (MM-DD-YYYY, blank for today): ")).strip()
+            if date_str_input:
+                try:
+                    _ = parse_mmddyyyy(date_str_input)
+                    date_str = date_str_input
+                except ValueError:
+                    print("Invalid date format. Using today instead.")
+                    date_str = format_date(datetime.date.today())
+            else:
                 date_str = format_date(datetime.date.today())
-        else:
-            date_str = format_date(datetime.date.today())
 
-        cost = prompt_float("Receipt cost ($)")
-        csv_path = append_receipt_csv(receipts_path, job_id, item_name, date_str, cost)
-        print(f"  ✓ Receipt logged to {csv_path}\n")
+            cost = prompt_float("Receipt cost ($)")
+            log_row(item_name, date_str, cost)
+            print("  ✓ Receipt added (saved when you finish)\n")
 
     reorganize_receipts_file(receipts_path)
     print("Receipts file reorganized by date and item.\n")
@@ -2260,25 +2610,26 @@ def log_receipt() -> None:
     print("\nEnter receipts for this job.")
     print("Press ENTER on Item description when you are finished.\n")
 
-    while True:
-        item_name = input(colored_prompt("Item / vendor / brief description (or ENTER to finish): ")).strip()
-        if not item_name:
-            break
+    with open_receipt_log(receipts_path, job_id) as log_row:
+        while True:
+            item_name = read_line("Item / vendor / brief description (or ENTER to finish): ", "receipt_item")
+            if not item_name:
+                break
 
-        date_str_input = input(colored_prompt("Receipt date (MM-DD-YYYY, blank for today): ")).strip()
-        if date_str_input:
-            try:
-                _ = parse_mmddyyyy(date_str_input)
-                date_str = date_str_input
-            except ValueError:
-                print("Invalid date format. Using today instead.")
+            date_str_input = input(colored_prompt("Receipt date (MM-DD-YYYY, blank for today): ")).strip()
+            if date_str_input:
+                try:
+                    _ = parse_mmddyyyy(date_str_input)
+                    date_str = date_str_input
+                except ValueError:
+                    print("Invalid date format. Using today instead.")
+                    date_str = format_date(datetime.date.today())
+            else:
                 date_str = format_date(datetime.date.today())
-        else:
-            date_str = format_date(datetime.date.today())
 
-        cost = prompt_float("Receipt cost ($)")
-        csv_path = append_receipt_csv(receipts_path, job_id, item_name, date_str, cost)
-        print(f"  ✓ Receipt logged to {csv_path}\n")
+            cost = prompt_float("Receipt cost ($)")
+            log_row(item_name, date_str, cost)
+            print("  ✓ Receipt added (saved when you finish)\n")
 
     reorganize_receipts_file(receipts_path)
     print("Receipts file reorganized by date and item.\n")
@@ -2289,28 +2640,53 @@ def log_receipt() -> None:
 #  MAIN MENU
 # =========================
 
+def _configure_stdio() -> None:
+    """
+    Script-driven runs (answers piped in from a file) read stdin through a
+    64 KiB UTF-8 buffer that replaces stray bytes instead of aborting.
+    Interactive terminals keep their stdin so readline still owns it.
+    """
+    if sys.stdin is not None and not sys.stdin.isatty():
+        sys.stdin = open(
+            sys.stdin.fileno(), "r", buffering=1 << 16,
+            encoding="utf-8", errors="replace", closefd=False,
+        )
+    # Progress lines show up as they are printed, even when stdout is piped
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=True)
+
+
+_MAIN_MENU = "\n".join([
+    colored_section("Select an option:"),
+    "  1. Create Quote",
+    "  2. Create Invoice",
+    "  3. Log Receipt",
+    "  4. Edit Existing Quote",
+    "  5. Exit",
+])
+
+
+_MAIN_ACTIONS: Dict[str, Callable[[], None]] = {
+    "1": lambda: create_quote_or_invoice("quote"),
+    "2": lambda: create_quote_or_invoice("invoice"),
+    "3": log_receipt,
+    "4": edit_existing_quote,
+}
+
+
 def main():
+    _configure_stdio()
     ensure_root_dir()
     print(colored_header("=== Cienega Construction Tool ==="))
     print(f"Root jobs folder: {ROOT_BASE_DIR}\n")
 
     while True:
-        print(colored_section("Select an option:"))
-        print("  1. Create Quote")
-        print("  2. Create Invoice")
-        print("  3. Log Receipt")
-        print("  4. Edit Existing Quote")
-        print("  5. Exit")
+        print(_MAIN_MENU)
 
         choice = input(colored_prompt("Choice (1–5): ")).strip()
-        if choice == "1":
-            create_quote_or_invoice("quote")
-        elif choice == "2":
-            create_quote_or_invoice("invoice")
-        elif choice == "3":
-            log_receipt()
-        elif choice == "4":
-            edit_existing_quote()
+        action = _MAIN_ACTIONS.get(choice)
+        if action is not None:
+            action()
         elif choice == "5":
             print("Goodbye.")
             break